@@ -18,8 +18,9 @@
 # 12-16-2009 Enable translation
 # 10-03-2022 Rename and add variable filter
 # 06-22-2024 Major rewrite to eliminate use of Dataset class
+# 10-14-2026 Add READSTAT option to read sav and zsav dictionaries with pyreadstat
 
-__version__ = "1.4.1"
+__version__ = "1.5.0"
 __author__ = "JKP, SPSS"
 
 # debugging
@@ -33,19 +34,39 @@ except:
     pass
 
 import spss, os, re
+import concurrent.futures
+import queue
+import threading
+import functools
 import spss, spssaux, spssdata
 from collections import defaultdict
 import random
 from extension import Template, Syntax
 from extension import processcmd
+# optional: used only for READSTAT=YES
+try:
+    import pyreadstat
+except ImportError:
+    pyreadstat = None
     
 maindsname = "D" + str(random.uniform(.05, 1))
 omsendname = "O" + str(random.uniform(.05, 1))
 omsvltag = "V" + str(random.uniform(.05, 1))
+# most files a directory listing can queue ahead of the main loop
+listingqueuesize = 1000
+
+# extensions and open commands for each file type.
+# The "spss" types, sav and zsav, are also the ones pyreadstat reads when READSTAT=YES.
+ftdict = {"spss":[".sav", ".zsav"], 
+    "spsspor": [".por"], 
+    "sas":[".sas7bdat",".sd7",".sd2",".ssd01",".ssd04", ".xpt"], "stata":[".dta"]}
+spsscmd = {"spss":"""GET FILE="%s." """, 
+    "spsspor": """IMPORT FILE="%s." """,
+    "sas": """GET SAS DATA="%s." """, "stata": """GET STATA FILE="%s." """}
 
 
 def gather(dsname, files, filetypes=["spss"], filenamepattern=None,attrlist=[], attrlength=256,
-        varnamepattern=None, valuelabels=False):
+        varnamepattern=None, valuelabels=False, usereadstat=False):
     """Create SPSS dataset listing variable names, variable labels, and source files for selected files.  Return the name of the new dataset.
     
     files is a list of files and/or directories.  If an item is a file, it is processed; if it is a directory, the files and subdirectories
@@ -60,6 +81,9 @@ def gather(dsname, files, filetypes=["spss"], filenamepattern=None,attrlist=[],
     attrlist is an optional list of custom attributes to be included in the output. For array attributes, only the first item is
     recorded.  The value is blank if the attribute is not present for the variable.  Attribute variables are
     strings of size attrlength bytes, truncated appropriately.
+    usereadstat, if True, reads the metadata of sav and zsav files with the pyreadstat module instead
+    of opening them in SPSS, which is much faster.  It requires pyreadstat and is ignored if attrlist is given,
+    since pyreadstat does not read custom attributes.
     
     The output is just a dataset.  It must be saved, if desired, after this function has completed.
     Its name is the return value of this function.
@@ -83,138 +107,285 @@ def gather(dsname, files, filetypes=["spss"], filenamepattern=None,attrlist=[],
     filecount = 0
             
     
-    files = [fixescapes(f) for f in files]  #UP is converting escape characters :-)
+    # the patterns are compiled once here rather than for every file
+    if filenamepattern:
+        try:
+            pat = _compilepattern(filenamepattern)
+        except:
+            raise ValueError(_("Invalid file name pattern: %s") % filenamepattern)
+    else:
+        pat = None
+
+    if varnamepattern:
+        try:
+            vpat = _compilepattern(varnamepattern)
+        except:
+            raise ValueError(_("Invalid variable name pattern: %s") % varnamepattern)
+    else:
+        vpat = None
+
+    # map each accepted extension to its open command so that each file needs only one lookup
+    ext2cmd = {ext: spsscmd[ft] for ft in filetypes for ext in ftdict[ft]}
+
     # walk the list of files and directories and open
     
 
-    fh = spssaux.FileHandles()
+    # file handle resolution is looked up once; each item is still used as given if it cannot be resolved
+    try:
+        resolve = spssaux.FileHandles().resolve
+    except:
+        resolve = None
     
     notfound = []
+    # identities of files already opened, so that a file reachable by more than one path is read once
+    seen = set()
+    work = []
     for item in files:
-        try:
-            item = fh.resolve(item)
-        except:
-            pass
+        item = item.replace("\\", "/")  #UP is converting escape characters :-)
+        if resolve is not None:
+            try:
+                item = resolve(item)
+            except:
+                pass
         if os.path.isfile(item):
-            filecount = addvarinfo(catalog, item, filetypes, filenamepattern, attrlist, attrlength, filecount, varnamepattern, valuelabels)
+            work.append((item, False))
         elif os.path.isdir(item): 
-            for dirpath, dirnames, fnames in os.walk(item):
-                for f in fnames:
-                    try:
-                        filecount = addvarinfo(catalog, os.path.join(dirpath, f),
-                        filetypes, filenamepattern, attrlist, attrlength, filecount, varnamepattern, valuelabels)
-                    except EnvironmentError as e:
-                        notfound.append(e.args[0])
+            work.append((item, True))
         else:
             if not isinstance(item, str):
                 item = str(item)
             notfound.append(_("Not found: %s") % item)
 
+    # Directory trees are listed on worker threads, each feeding its own queue, while this
+    # thread opens the files as they arrive.  Only this thread talks to the backend, since
+    # files are opened as the active dataset, and the queues are consumed in the order given
+    # so that the catalog order is unchanged.  The queues are bounded, so a listing that runs
+    # ahead of the main loop waits, and stop ends the listings early if the main loop fails.
+    ndirs = sum(isdir for item, isdir in work)
+    # attribute names are matched caselessly; lower them once for the whole run
+    anames = tuple(a.lower() for a in attrlist)
+    if usereadstat and pyreadstat is None:
+        print(_("The pyreadstat module is not installed.  Files will be read with SPSS."))
+        usereadstat = False
+    elif usereadstat and anames:
+        print(_("Custom attributes cannot be read with pyreadstat.  Files will be read with SPSS."))
+        usereadstat = False
+    # one OMS request keeps the per-file output out of the Viewer for the whole run
+    spss.Submit(f"""oms select all except = texts /destination viewer=no /tag ={omsendname}.""")
+    stop = threading.Event()
+    pool = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(ndirs, os.cpu_count() or 1)))
+    try:
+        listings = []
+        for item, isdir in work:
+            if isdir:
+                entries = queue.Queue(maxsize=listingqueuesize)
+                listings.append((entries, pool.submit(_listfiles, item, ext2cmd, pat, entries, stop)))
+            else:
+                listings.append(None)
+        for (item, isdir), listing in zip(work, listings):
+            if not isdir:
+                filecount = addinfo(item, ext2cmd, catalog, valuelabels, anames, filecount, pat, vpat, seen,
+                    usereadstat=usereadstat)
+                continue
+            entries, producer = listing
+            for entry, cmd in iter(entries.get, None):
+                try:
+                    filecount = addinfo(entry.path, ext2cmd, catalog, valuelabels, anames, filecount,
+                        pat, vpat, seen, entry, usereadstat, cmd)
+                except EnvironmentError as e:
+                    notfound.append(e.args[0])
+            producer.result()   # raises anything the walk raised
+    finally:
+        stop.set()
+        pool.shutdown(cancel_futures=True)
+        spss.Submit(f"""omsend tag=["{omsendname}"].""")
+    # the SPSS messages for files that failed to open were suppressed along with the rest
+    for msg in notfound:
+        print(msg)
+
     # make dataset from catalog list
     makedataset(catalog, dsname, valuelabels, attrlist)
     print(_(f"""*** Files processed: {filecount}"""))
     
-def addvarinfo(catalog, filespec, filetypes, filenamepattern, attrlist, attrlength, filecount, 
-        varnamepattern=None, valuelabels=None):
-    """add variable information to a dataset.
+def _iter_files(root):
+    """generate DirEntry objects for all the files in or under directory root
     
-    catalog is the  list of records to append to.
-    filetypes is the list of file types to include.
-    filenamepattern is a regular expression to filter filename roots.
-    dsvars is a special dictionary of variables and attributes.  See function addunique.
-    attrindexes is a dictionary with keys of lower case attribute names and values as the dataset index starting with 0.
-    attrlength is the size of the attribute string variables
-    valuelabels indicates whether or not to include value label information"""
-
-    ftdict = {"spss":[".sav", ".zsav"], 
-        "spsspor": [".por"], 
-        "sas":[".sas7bdat",".sd7",".sd2",".ssd01",".ssd04", ".xpt"], "stata":[".dta"]}
-    spsscmd = {"spss":"""GET FILE="%s." """, 
-        "spsspor": """IMPORT FILE="%s." """,
-        "sas": """GET SAS DATA="%s." """, "stata": """GET STATA FILE="%s." """}
-    if filenamepattern:
+    This uses os.scandir so that the file type cached from the directory read
+    is used instead of a stat call per entry.  Symbolic links to directories are not
+    followed, and unreadable directories are skipped, as with os.walk.
+    Files come out in the same top-down order as os.walk: the files of a directory,
+    then each subdirectory in listing order."""
+    
+    stack = [root]
+    while stack:
+        d = stack.pop()
         try:
-            pat = re.compile(filenamepattern, re.IGNORECASE)
-        except:
-            raise ValueError(_("Invalid file name pattern: %s") % filenamepattern)
-    else:
-        pat = None
-        
-    if varnamepattern:
+            it = os.scandir(d)
+        except OSError:
+            continue
+        subdirs = []
+        with it:
+            for e in it:
+                try:
+                    if e.is_dir(follow_symlinks=False):
+                        subdirs.append(e.path)
+                    elif e.is_file():
+                        yield e
+                except OSError:
+                    pass
+        # reversed so that the first subdirectory listed is the next one popped
+        stack.extend(reversed(subdirs))
+
+def _listfiles(root, ext2cmd, pat, entries, stop):
+    """put (DirEntry, open command) pairs for the selected files in or under root on queue entries
+    
+    The extension and file name filters are applied here, on the listing thread,
+    so rejected files never reach the main loop, and selected ones arrive with their
+    open command.  None is put last, even if the walk fails.
+    stop is a threading.Event.  Once it is set, the walk ends and nothing more is put."""
+    
+    try:
+        for entry in _iter_files(root):
+            if stop.is_set():
+                return
+            cmd = selectfile(entry.name, ext2cmd, pat)
+            if cmd is not None:
+                _put(entries, (entry, cmd), stop)
+    finally:
+        _put(entries, None, stop)
+
+def _put(entries, item, stop):
+    """put item on the bounded queue entries, waiting for room unless stop is set"""
+    
+    while not stop.is_set():
         try:
-            vpat = re.compile(varnamepattern, re.IGNORECASE)
-        except:
-            raise ValueError(_("Invalid variable name pattern: %s") % varnamepattern)
-    else:
-        vpat = None
-    filecount = addinfo(filespec, filetypes, ftdict, spsscmd, catalog, valuelabels, attrlist, filecount, pat, vpat)
-    return filecount
+            entries.put(item, timeout=.1)
+            return
+        except queue.Full:
+            pass
+
+def _filekey(filespec, entry=None):
+    """return a key identifying the physical file filespec, following links
+    
+    The key is the device and inode from one stat call, taken from entry, an os.DirEntry,
+    when given.  Where the file system reports no inode, as DirEntry does on Windows,
+    the file is stat'ed by path, and failing that the normalized real path is used."""
+    
+    try:
+        st = entry.stat() if entry is not None else None
+        if st is None or not st.st_ino:
+            st = os.stat(filespec)
+        if st.st_ino:
+            return (st.st_dev, st.st_ino)
+    except OSError:
+        pass
+    return os.path.normcase(os.path.realpath(filespec))
+
+def selectfile(basename, ext2cmd, pat):
+    """return the command to open a file if it is selected, else None
+    
+    basename is the file name without directory
+    ext2cmd maps the lower case extensions to include to the command that opens them
+    pat is the compiled pattern to filter filename roots or None"""
+    
+    fn, ext = os.path.splitext(basename)
+    cmd = ext2cmd.get(ext.lower())
+    if cmd is None or (pat is not None and not pat.match(fn)):
+        return None
+    return cmd
 
-def addinfo(filespec, filetypes, ftdict, spsscmd, catalog, valuelabels, attrlist, filecount, pat=None, vpat=None):
+def addinfo(filespec, ext2cmd, catalog, valuelabels, anames, filecount, pat=None, vpat=None, seen=None,
+        entry=None, usereadstat=False, cmd=None):
     """open the file if appropriate type, extract variable information, and add it to catalog.
     
     filespec is the file to open
-    dsname is the dataset name to append to
-    filetypes is the list of file types to include."""
-    
-    fnsplit = os.path.split(filespec)[1]
-    fn, ext = os.path.splitext(fnsplit)
-    ext = ext.lower()
-    havedsname = False
+    ext2cmd maps the lower case extensions to include to the command that opens them
+    catalog is the list of records to append to.
+    valuelabels indicates whether or not to include value label information
+    anames is a sequence of lower case attribute names to record
+    filecount is the number of files processed so far.  The updated count is returned.
+    pat is the compiled pattern to filter filename roots or None.
+    vpat is the compiled pattern to filter variable names or None.
+    seen is an optional set of identities of files already processed.  It is updated.
+    entry is the os.DirEntry for filespec if it came from a directory walk.  Its name
+    and stat information are used instead of parsing and resolving filespec again.
+    usereadstat indicates whether sav and zsav files are read with pyreadstat instead of SPSS
+    cmd is the command to open filespec if the file has already been selected, as
+    directory listings do.  Otherwise the extension and file name pattern are checked
+    here before the file is opened, so files that are not selected never reach the backend."""
+    
+    if cmd is None:
+        cmd = selectfile(os.path.basename(filespec), ext2cmd, pat)
+        if cmd is None:
+            return filecount
+    if seen is not None:
+        key = _filekey(filespec, entry)
+        if key in seen:
+            return filecount
+        seen.add(key)
+    if usereadstat and cmd == spsscmd["spss"]:
+        rows = getreadstatinfo(filespec, vpat, valuelabels)
+        if rows is not None:
+            catalog.extend(rows)
+            return filecount + 1
+        # pyreadstat could not read it, so let GET FILE try
 
-    for ft in filetypes:
-        if ext in ftdict[ft]:
-            if pat is None or pat.match(fn):
-                try:
-                    spss.Submit(spsscmd[ft] % filespec)
-                    spss.Submit(f"DATASET NAME {maindsname}.")
-                    havedsname = True
-                except:
-                    raise EnvironmentError(_("File could not be opened, skipping: %s") % filespec)
-            else:
-                continue
-        else:
-            continue
-        filecount = filecount + 1
-        spss.Submit(f"""oms select all except = texts /destination viewer=no /tag ={omsendname}.""")
-        # get value labels first.  Otherwise vardict will reflect the wrong dataset.
-        if valuelabels:
-            vldict = getvaluelabels()
-        spss.Submit(f"DATASET ACTIVATE {maindsname}.")
-        if vpat:
-            vardict = spssaux.VariableDict(pattern=vpat, caseless=True)
-        else:
-            vardict = spssaux.VariableDict(caseless=True)
-        try:
-            for v in vardict:
-                try:
-                    record = ([filespec, v.VariableName, v.VariableLabel])
-                    if valuelabels:
-                        try:                            
-                            record.append(len(vldict[v.VariableName]))  # number of value labels
-                            record.append(";".join(vldict[v.VariableName])) # concatinated labels
-                        except:
-                            record.append(0)
-                            record.append("")
-                except:
-                    print(f"""Bad character in file {filespec}, variable {v.VariableName} in variable name or label""")                    
-    
-                if attrlist:
-                    attrs = getattributes(vardict, v.VariableName, attrlist)
-                    record.extend(attrs)
-                catalog.append(record)
-        finally:
-            spss.Submit(f"""omsend tag=["{omsendname}"].""")
-            
-    if havedsname:
-        spss.Submit(f"DATASET CLOSE {maindsname}.")
+    try:
+        spss.Submit(cmd % filespec)
+        spss.Submit(f"DATASET NAME {maindsname}.")
+    except:
+        raise EnvironmentError(_("File could not be opened, skipping: %s") % filespec)
+    filecount = filecount + 1
+    vardict = spssaux.VariableDict(caseless=True)
+    # the names are already in the VariableDict, so filter them here before
+    # any labels or attributes are fetched
+    variables = [v for v in vardict if vpat is None or vpat.match(v.VariableName)]
+    # value labels are only worth the DISPLAY DICT pass if some variable was selected.
+    # vardict reads from the active dataset, so getvaluelabels leaves the main one active.
+    # The optional parts of a record are chosen once per file, and each returns () when not wanted.
+    if valuelabels and variables:
+        vldict = getvaluelabels(maindsname)
+        def vlpart(v):
+            return vldict.get(v.VariableName, (0, ""))  # number of value labels, concatenated labels
+    else:
+        def vlpart(v):
+            return ()
+    if anames:
+        def attrpart(v):
+            return tuple(getattributes(v, anames))
+    else:
+        def attrpart(v):
+            return ()
+    def makerows(variables):
+        return [(filespec, v.VariableName, v.VariableLabel) + vlpart(v) + attrpart(v) for v in variables]
+
+    # records for this file are collected locally and added to the catalog in one step.
+    # They have a fixed shape, so they are kept as tuples.
+    # Only if some variable has a bad character are the variables checked one at a time
+    # so that it can be reported and skipped.
+    try:
+        rows = makerows(variables)
+    except:
+        kept = []
+        for v in variables:
+            try:
+                v.VariableName, v.VariableLabel
+                kept.append(v)
+            except:
+                print(f"""Bad character in file {filespec}, variable {v.VariableName} in variable name or label""")                    
+        rows = makerows(kept)
+    catalog.extend(rows)
+
+    spss.Submit(f"DATASET CLOSE {maindsname}.")
     return filecount
 
-def getvaluelabels():
+def getvaluelabels(dsname):
     """return value labels dict for current active file
     
+    dsname is the name of the active dataset.  It is active again on return.
     key = varname
-    value is the value label"""
+    value is a (count, labels) pair, where labels is the value labels joined with ";"
+    Variables without value labels are omitted."""
     
     # uses DISPLAY DICT and OMS due to performance problems with Dataset apis
     # DISPLAY DICT does not produce a value labels row if a variable has no labels
@@ -231,7 +402,7 @@ def getvaluelabels():
     # and sometimes it omits the dataset altoghether when there are no value labels
     try:
         spss.Submit("DATASET ACTIVATE vls")
-    except:   # no value labels
+    except:   # no value labels, and dsname is still active
         return {}
         
     d = defaultdict(list)
@@ -241,26 +412,52 @@ def getvaluelabels():
             d[item[0].rstrip()].append(item[1].rstrip())
     except:
         pass
-    spss.Submit(f"""DATASET CLOSE vls.""")
-    return d
+    spss.Submit(f"""DATASET ACTIVATE {dsname}.
+    DATASET CLOSE vls.""")
+    # join once here so the per-variable record loop only does a lookup
+    return {name: (len(labels), ";".join(labels)) for name, labels in d.items()}
       
-def getattributes(vardict, varname, attrlist):
-    """return list of custom attribute values named in attrlist
+def getreadstatinfo(filespec, vpat, valuelabels):
+    """return the catalog records for a sav or zsav file read with pyreadstat, or None if it cannot be read
+    
+    Only the dictionary is read, and nothing is submitted to SPSS, so the active dataset is unaffected.
+    filespec is the file to read
+    vpat is the compiled pattern to filter variable names or None.
+    valuelabels indicates whether or not to include value label information"""
+    
+    try:
+        df, meta = pyreadstat.read_sav(filespec, metadataonly=True)
+    except Exception:
+        return None
+    labels = meta.column_names_to_labels
+    vldict = meta.variable_value_labels
+    rows = []
+    for vname in meta.column_names:
+        if vpat is not None and not vpat.match(vname):
+            continue
+        record = (filespec, vname, labels.get(vname) or "")
+        if valuelabels:
+            # ordered by value and stripped, as DISPLAY DICT gives them on the SPSS path
+            vls = vldict.get(vname)
+            if vls:
+                record += (len(vls), ";".join(label.rstrip() for value, label in sorted(vls.items())))
+            else:
+                record += (0, "")
+        rows.append(record)
+    return rows
+
+def getattributes(var, anames):
+    """return list of custom attribute values named in anames
     
     returned value is blank if attribute is  not present
-    vardict is a VariableDict object
-    varname is the variable name (not case sensitive)
-    attrlist is a list of attribute names
+    var is a variable from a VariableDict object
+    anames is a sequence of lower case attribute names
     """
     
     # sometimes there are no attributes, and we want to suppress the message
     # but that would be too many OMS invocations
-    attrs = []
-    anames = [aname.lower() for aname in attrlist]
-    vattr = {k.lower(): v for (k, v) in vardict[varname].Attributes.items()}
-    for a in anames:
-        attrs.append(str(vattr.get(a, "")))
-    return attrs
+    vattr = {k.lower(): v for (k, v) in var.Attributes.items()}
+    return [str(vattr.get(a, "")) for a in anames]
     
     
 #def addunique(dsdict, key):
@@ -283,16 +480,46 @@ def getattributes(vardict, varname, attrlist):
     #dsdict[key1] = keymod
     #return key1
 
+class _LiteralPrefix:
+    """stand-in for a compiled pattern that has no regular expression metacharacters
+    
+    Such a pattern, anchored at the start and ignoring case, is just a prefix test,
+    which str.startswith does without the regular expression engine.  Lower casing agrees
+    with re.IGNORECASE only for ASCII, so the pattern must be ASCII, and names that are not
+    are matched with the compiled expression."""
+    
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.prefix = pattern.lower()
+        self.regex = re.compile(pattern, re.IGNORECASE)
+        
+    def match(self, s):
+        if s.isascii():
+            return s.lower().startswith(self.prefix)
+        return self.regex.match(s)
+
+@functools.lru_cache(maxsize=128)
+def _compilepattern(pattern):
+    """return a case-insensitive matcher for pattern with a match method like re.match
+    
+    Literal ASCII patterns such as "car" get a plain prefix test.
+    Matchers are cached, so repeated gather calls with the same patterns reuse them."""
+    
+    if pattern.isascii() and re.escape(pattern) == pattern:
+        return _LiteralPrefix(pattern)
+    return re.compile(pattern, re.IGNORECASE)
+
 escapelist = [('\a', r'\a'), ('\b', r'\b'), ('\f', r'\f'), ('\n', r'\n'), ('\r', r'\r'), ('\t',r'\t'),('\v', r'\v')]
 
 def fixescapes(item):
-    return(re.sub(r"\\", "/", item))
+    # kept for callers outside this module; gather does the replacement inline
+    return item.replace("\\", "/")
 
 
 def makedataset(catalog, dsname, valuelabels, attrlist):
     """Create a dataset from the catalog
     
-    catalog is a list of variable records.  Each record has
+    catalog is a list of variable record tuples.  Each record has
         file name, variable name, variable label and, optionally
         value label count and value label, and optionally attribute values for
         selected attributes
@@ -311,10 +538,8 @@ def makedataset(catalog, dsname, valuelabels, attrlist):
         vls = spssdata.vdef("ValueLabels", vtype=1000, vlabel = _("Value Labels"))
     if attrlist:
         # calculate required length of attribute strings across all selected attributes
-        maxalen = 0
-        for row in catalog:
-            for a in row[-len(attrlist):]:
-                maxalen = max(max([maxalen], [len(item) for item in [a]]))
+        nattrs = len(attrlist)
+        maxalen = max((len(a) for row in catalog for a in row[-nattrs:]), default=0)
         maxalen = max(maxalen, 1)
         attrvars = []
         for attr in attrlist:
@@ -333,17 +558,19 @@ def makedataset(catalog, dsname, valuelabels, attrlist):
             curs.append(a)
     curs.commitdict()
     
+    # catalog records are laid out in the same order as the new variables,
+    # so each case is written in one pass over its record
+    outnames = ["source", "variableName", "variableLabel"]
+    if valuelabels:
+        outnames.extend(["NvalueLabels", "ValueLabels"])
+    if attrlist:
+        outnames.extend(attrlist)
+    appendvalue = curs.appendvalue
+    commitcase = curs.CommitCase
     for item in catalog:
-        curs.appendvalue("source", item[0])
-        curs.appendvalue("variableName", item[1])
-        curs.appendvalue("variableLabel", item[2])
-        if valuelabels:
-            curs.appendvalue("NvalueLabels", item[3])
-            curs.appendvalue("ValueLabels", item[4])
-        if attrlist:
-            for i, a in enumerate(attrlist):
-                curs.appendvalue(a, item[3 + i + (valuelabels and 2 or 0)])
-        curs.CommitCase()
+        for name, value in zip(outnames, item):
+            appendvalue(name, value)
+        commitcase()
     curs.CClose()
     spss.Submit(f"""DATASET NAME {dsname}""")
 
@@ -420,7 +647,8 @@ def Run(args):
         Template("VALUELABELS", subc="OPTIONS", var="valuelabels", ktype="bool"),
         
         Template("", subc="ATTRIBUTES", var="attrlist", ktype="varname", islist=True),
-        Template("VARNAMEPATTERN", subc="OPTIONS", var="varnamepattern", ktype="literal")
+        Template("VARNAMEPATTERN", subc="OPTIONS", var="varnamepattern", ktype="literal"),
+        Template("READSTAT", subc="OPTIONS", var="usereadstat", ktype="bool")
     ])
     
     global _
@@ -436,21 +664,21 @@ def Run(args):
     else:
         processcmd(oobj, args, gather)
 
+# the help file location is computed once from the current module name
+_HELPSPEC = "file://" + os.path.splitext(__file__)[0] + os.path.sep + \
+     "markdown.html"
+
 def helper():
     """open html help in default browser window
     
     The location is computed from the current module name"""
     
-    import webbrowser, os.path
-    
-    path = os.path.splitext(__file__)[0]
-    helpspec = "file://" + path + os.path.sep + \
-         "markdown.html"
+    import webbrowser
     
     # webbrowser.open seems not to work well
     browser = webbrowser.get()
-    if not browser.open_new(helpspec):
-        print(("Help file not found:" + helpspec))
+    if not browser.open_new(_HELPSPEC):
+        print(("Help file not found:" + _HELPSPEC))
 try:    #override
     from extension import helper
 except: